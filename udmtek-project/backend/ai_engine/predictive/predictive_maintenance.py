@@ -3,34 +3,143 @@ Predictive Maintenance AI Engine
 Machine learning models for failure prediction and maintenance scheduling
 """
 
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
-from enum import Enum
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
 from datetime import datetime, timedelta
+from collections import OrderedDict
+import bisect
+import functools
+import itertools
+import operator
 import numpy as np
+from numba import njit, prange
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class MaintenanceType(Enum):
+class MaintenanceType(IntEnum):
     """Types of maintenance"""
-    PREVENTIVE = "PREVENTIVE"
-    CORRECTIVE = "CORRECTIVE"
-    PREDICTIVE = "PREDICTIVE"
-    CONDITION_BASED = "CONDITION_BASED"
+    PREVENTIVE = 0
+    CORRECTIVE = 1
+    PREDICTIVE = 2
+    CONDITION_BASED = 3
 
 
-class EquipmentHealth(Enum):
+# Serialized names, indexed by MaintenanceType
+MAINTENANCE_TYPE_STR = ("PREVENTIVE", "CORRECTIVE", "PREDICTIVE", "CONDITION_BASED")
+
+
+class EquipmentHealth(IntEnum):
     """Equipment health status"""
-    EXCELLENT = "EXCELLENT"    # 90-100%
-    GOOD = "GOOD"              # 70-89%
-    FAIR = "FAIR"              # 50-69%
-    POOR = "POOR"              # 30-49%
-    CRITICAL = "CRITICAL"      # 0-29%
+    EXCELLENT = 0    # 90-100%
+    GOOD = 1         # 70-89%
+    FAIR = 2         # 50-69%
+    POOR = 3         # 30-49%
+    CRITICAL = 4     # 0-29%
+
+
+# Serialized names, indexed by EquipmentHealth
+EQUIPMENT_HEALTH_STR = ("EXCELLENT", "GOOD", "FAIR", "POOR", "CRITICAL")
+
+
+# Precomputed recommendation actions (shared, immutable)
+_CRITICAL_ACTIONS = (
+    "Perform emergency inspection",
+    "Schedule immediate maintenance",
+    "Prepare replacement parts"
+)
+_POOR_ACTIONS = (
+    "Schedule maintenance within 1 week",
+    "Monitor closely",
+    "Order replacement parts"
+)
+_FAIR_ACTIONS = (
+    "Schedule routine maintenance",
+    "Continue monitoring"
+)
+_TIME_BASED_ACTIONS = (
+    "Perform scheduled maintenance",
+    "Replace worn components",
+    "Lubrication service"
+)
+_ANOMALY_ACTIONS = (
+    "Investigate unusual patterns",
+    "Perform detailed inspection",
+    "Review recent operational changes",
+    "Monitor closely"
+)
+
+# Health-based templates: (priority, maintenance_type, actions, description_fmt)
+_HEALTH_BINS = (30, 50)
+_HEALTH_TEMPLATES = (
+    (1, MaintenanceType.CORRECTIVE, _CRITICAL_ACTIONS,
+     "Critical health status ({health_score:.1f}%) - immediate attention required"),
+    (2, MaintenanceType.PREDICTIVE, _POOR_ACTIONS,
+     "Poor health status ({health_score:.1f}%) - maintenance recommended soon"),
+    (3, MaintenanceType.CONDITION_BASED, _FAIR_ACTIONS,
+     "Fair health status ({health_score:.1f}%) - plan maintenance")
+)
+
+_RATED_CURRENT = 10.0  # A
+
+# Equipment whose last check inputs/results are kept for change detection
+_MAX_CACHED_EQUIPMENT = 1024
 
+# Operating hours score bins (newer is better)
+_OP_BINS_LIST = (1000, 5000, 10000)
+_OP_SCORES_LIST = (100, 90, 70, 50)
+_OP_BINS = np.array(_OP_BINS_LIST, dtype=np.float64)
+_OP_SCORES = np.array(_OP_SCORES_LIST, dtype=np.float64)
 
-@dataclass
+# Sensor trend templates:
+# sensor -> (threshold, priority, confidence, actions, cost, downtime, rul_days, id_prefix, description_fmt)
+_SENSOR_TREND_TEMPLATES = {
+    "vibration": (
+        10.0,  # mm/s threshold
+        2, 0.80,
+        (
+            "Check bearing condition",
+            "Verify alignment",
+            "Balance rotating components",
+            "Inspect mounting"
+        ),
+        3000.0, 180, 14, "REC_VIB",
+        "Excessive vibration detected ({value:.2f} mm/s)"
+    ),
+    "temperature": (
+        80.0,  # °C threshold
+        2, 0.75,
+        (
+            "Check cooling system",
+            "Verify lubrication",
+            "Clean heat exchanger",
+            "Check for overload"
+        ),
+        1500.0, 90, 7, "REC_TEMP",
+        "Elevated temperature ({value:.1f}°C)"
+    ),
+    "current": (
+        _RATED_CURRENT * 1.2,  # for motors
+        1, 0.85,
+        (
+            "Check for mechanical binding",
+            "Verify load conditions",
+            "Inspect motor windings",
+            "Check for phase imbalance"
+        ),
+        4000.0, 240, 3, "REC_CURR",
+        "Overcurrent condition ({value:.2f}A, rated {rated_current}A)"
+    )
+}
+
+# Column order and thresholds for the vectorized sensor trend kernel
+_SENSOR_TREND_NAMES = tuple(_SENSOR_TREND_TEMPLATES)
+_SENSOR_TREND_THRESHOLDS = np.array([t[0] for t in _SENSOR_TREND_TEMPLATES.values()])
+
+
+@dataclass(slots=True)
 class MaintenanceRecommendation:
     """Maintenance action recommendation"""
     equipment_id: str
@@ -42,18 +151,23 @@ class MaintenanceRecommendation:
     remaining_useful_life: Optional[int]  # days
     confidence: float
     description: str
-    recommended_actions: List[str]
+    recommended_actions: Sequence[str]
     estimated_cost: Optional[float]
     estimated_downtime: Optional[int]  # minutes
+    _rul_key: int = field(init=False, repr=False, compare=False)  # schedule sort key
+    
+    def __post_init__(self):
+        self._rul_key = self.remaining_useful_life if self.remaining_useful_life is not None else 999
     
     def to_dict(self) -> Dict[str, Any]:
+        failure_date = self.predicted_failure_date
         return {
             "equipment_id": self.equipment_id,
             "recommendation_id": self.recommendation_id,
             "timestamp": self.timestamp.isoformat(),
-            "maintenance_type": self.maintenance_type.value,
+            "maintenance_type": MAINTENANCE_TYPE_STR[self.maintenance_type],
             "priority": self.priority,
-            "predicted_failure_date": self.predicted_failure_date.isoformat() if self.predicted_failure_date else None,
+            "predicted_failure_date": failure_date.isoformat() if failure_date else None,
             "remaining_useful_life_days": self.remaining_useful_life,
             "confidence": self.confidence,
             "description": self.description,
@@ -63,7 +177,7 @@ class MaintenanceRecommendation:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EquipmentStatus:
     """Current equipment status"""
     equipment_id: str
@@ -77,6 +191,137 @@ class EquipmentStatus:
     degradation_rate: float  # per day
 
 
+# Degradation models for different equipment types
+#
+# All models share one signature so they can be dispatched from a single
+# table: (health_score, operating_hours, cycles_count, temperature, vibration)
+
+@njit(cache=True)
+def _motor_rul(health_score: float, operating_hours: float, cycles_count: int,
+               temperature: float, vibration: float) -> int:
+    """Predict motor remaining useful life"""
+    
+    # Factors affecting motor life
+    base_life = 36500  # days (100 years new motor)
+    
+    # Reduce based on operating hours
+    life_reduction = operating_hours / 100  # days
+    
+    # Reduce based on health score
+    health_factor = health_score / 100
+    
+    # Reduce based on temperature
+    temp_factor = max(0.0, 1 - (temperature - 40) / 100)  # Reduce life at high temp
+    
+    rul = int(base_life * health_factor * temp_factor - life_reduction)
+    
+    return max(1, rul)
+
+
+@njit(cache=True)
+def _pump_rul(health_score: float, operating_hours: float, cycles_count: int,
+              temperature: float, vibration: float) -> int:
+    """Predict pump remaining useful life"""
+    base_life = 18250  # days (50 years)
+    
+    health_factor = health_score / 100
+    cycles_factor = max(0.0, 1 - cycles_count / 1000000)
+    
+    rul = int(base_life * health_factor * cycles_factor)
+    
+    return max(1, rul)
+
+
+@njit(cache=True)
+def _valve_rul(health_score: float, operating_hours: float, cycles_count: int,
+               temperature: float, vibration: float) -> int:
+    """Predict valve remaining useful life"""
+    base_life = 7300  # days (20 years)
+    
+    health_factor = health_score / 100
+    cycles_factor = max(0.0, 1 - cycles_count / 100000)
+    
+    rul = int(base_life * health_factor * cycles_factor)
+    
+    return max(1, rul)
+
+
+@njit(cache=True)
+def _sensor_rul(health_score: float, operating_hours: float, cycles_count: int,
+                temperature: float, vibration: float) -> int:
+    """Predict sensor remaining useful life"""
+    base_life = 3650  # days (10 years)
+    
+    health_factor = health_score / 100
+    
+    rul = int(base_life * health_factor)
+    
+    return max(1, rul)
+
+
+@njit(cache=True)
+def _bearing_rul(health_score: float, operating_hours: float, cycles_count: int,
+                 temperature: float, vibration: float) -> int:
+    """Predict bearing remaining useful life"""
+    base_life = 1825  # days (5 years)
+    
+    health_factor = health_score / 100
+    
+    # Vibration impact
+    vib_factor = max(0.0, 1 - vibration / 50)
+    
+    rul = int(base_life * health_factor * vib_factor)
+    
+    return max(1, rul)
+
+
+
+@functools.lru_cache(maxsize=4096)
+def _equipment_type(equipment_id: str) -> str:
+    """Extract equipment type from ID prefix (e.g. MOTOR_001 -> motor)"""
+    return equipment_id.split("_", 1)[0].lower()
+
+
+# Equipment type codes used by the batch RUL kernel
+EQUIPMENT_TYPE_CODES = {
+    "motor": 0,
+    "pump": 1,
+    "valve": 2,
+    "sensor": 3,
+    "bearing": 4
+}
+
+
+@njit(parallel=True, cache=True)
+def _rul_batch(types, op_hours, health, temp, vib, cycles):
+    """Predict remaining useful life for a fleet (-1 for unknown types)"""
+    n = types.shape[0]
+    rul = np.empty(n, dtype=np.int64)
+    
+    for i in prange(n):
+        health_factor = health[i] / 100
+        t = types[i]
+        
+        if t == 0:    # motor
+            temp_factor = max(0.0, 1 - (temp[i] - 40) / 100)
+            days = int(36500 * health_factor * temp_factor - op_hours[i] / 100)
+        elif t == 1:  # pump
+            days = int(18250 * health_factor * max(0.0, 1 - cycles[i] / 1000000))
+        elif t == 2:  # valve
+            days = int(7300 * health_factor * max(0.0, 1 - cycles[i] / 100000))
+        elif t == 3:  # sensor
+            days = int(3650 * health_factor)
+        elif t == 4:  # bearing
+            days = int(1825 * health_factor * max(0.0, 1 - vib[i] / 50))
+        else:
+            rul[i] = -1
+            continue
+        
+        rul[i] = max(1, days)
+    
+    return rul
+
+
 class PredictiveMaintenanceEngine:
     """
     AI-powered predictive maintenance engine
@@ -87,6 +332,12 @@ class PredictiveMaintenanceEngine:
         self.ml_models = {}
         self.equipment_database = {}
         self.failure_history = []
+        self._rec_counter = itertools.count()
+        # Per-equipment inputs and results of the last evaluation of each check,
+        # least recently analyzed equipment evicted first
+        self._last_evaluations: OrderedDict[
+            str, Tuple[Dict[str, Tuple], Dict[str, Any]]
+        ] = OrderedDict()
         self._initialize_models()
         logger.info("Predictive Maintenance Engine initialized")
     
@@ -96,13 +347,17 @@ class PredictiveMaintenanceEngine:
         # For now, using rule-based approach
         
         self.degradation_models = {
-            "motor": self._motor_degradation_model,
-            "pump": self._pump_degradation_model,
-            "valve": self._valve_degradation_model,
-            "sensor": self._sensor_degradation_model,
-            "bearing": self._bearing_degradation_model
+            "motor": _motor_rul,
+            "pump": _pump_rul,
+            "valve": _valve_rul,
+            "sensor": _sensor_rul,
+            "bearing": _bearing_rul
         }
         
+        # Warm up the JIT so the first prediction does not pay compile cost
+        for model_func in self.degradation_models.values():
+            model_func(100.0, 0.0, 0, 40.0, 0.0)
+        
         logger.info(f"Loaded {len(self.degradation_models)} degradation models")
     
     def predict_maintenance(self, equipment_status: EquipmentStatus) -> List[MaintenanceRecommendation]:
@@ -117,31 +372,60 @@ class PredictiveMaintenanceEngine:
         """
         logger.info(f"Analyzing equipment: {equipment_status.equipment_id}")
         
+        status = equipment_status
+        readings = status.sensor_readings
+        now = datetime.now()
+        
+        last_inputs, last_results = self._cached_evaluations(status.equipment_id)
+        
+        def rerun_if_changed(check: str, inputs: Tuple, evaluate) -> List[MaintenanceRecommendation]:
+            # Only re-fire a check when one of the inputs it depends on changed
+            if last_inputs.get(check) != inputs:
+                last_inputs[check] = inputs
+                last_results[check] = evaluate()
+                return last_results[check]
+            return [self._reissue(rec, now) for rec in last_results[check]]
+        
         recommendations = []
+        extend = recommendations.extend  # bound once, used per check
         
         # 1. Health-based recommendations
-        if equipment_status.health_score < 50:
-            rec = self._create_health_based_recommendation(equipment_status)
-            recommendations.append(rec)
-        
-        # 2. Time-based recommendations
-        time_rec = self._check_time_based_maintenance(equipment_status)
+        extend(rerun_if_changed(
+            "health",
+            (status.health_score,),
+            lambda: [self._create_health_based_recommendation(status, now=now)]
+            if status.health_score < 50 else []
+        ))
+        
+        # 2. Time-based recommendations (depends on the clock, always evaluated)
+        time_rec = self._check_time_based_maintenance(status, now=now)
         if time_rec:
             recommendations.append(time_rec)
         
         # 3. Condition-based recommendations
-        condition_recs = self._analyze_sensor_trends(equipment_status)
-        recommendations.extend(condition_recs)
-        
-        # 4. Predict remaining useful life
-        rul_rec = self._predict_remaining_useful_life(equipment_status)
-        if rul_rec:
-            recommendations.append(rul_rec)
+        extend(rerun_if_changed(
+            "sensors",
+            (readings.get("vibration"), readings.get("temperature"), readings.get("current")),
+            lambda: self._analyze_sensor_trends(status, now=now)
+        ))
+        
+        # 4. Predict remaining useful life (only the estimate is cached; the
+        #    recommendation is rebuilt so its failure date and actions agree)
+        rul_inputs = (status.health_score, status.operating_hours, status.cycles_count,
+                      readings.get("temperature"), readings.get("vibration"))
+        if last_inputs.get("rul") != rul_inputs:
+            last_inputs["rul"] = rul_inputs
+            last_results["rul"] = self._estimate_remaining_useful_life(status)
+        if last_results["rul"] is not None:
+            recommendations.append(self._create_rul_recommendation(status, last_results["rul"], now=now))
         
         # 5. Anomaly-based recommendations
-        if equipment_status.anomaly_score > 0.7:
-            anomaly_rec = self._create_anomaly_recommendation(equipment_status)
-            recommendations.append(anomaly_rec)
+        extend(rerun_if_changed(
+            "anomaly",
+            (status.anomaly_score,),
+            lambda: [self._create_anomaly_recommendation(status, now=now)]
+            if status.anomaly_score > 0.7 else []
+        ))
         
         # Sort by priority
         recommendations.sort(key=lambda x: x.priority)
@@ -149,40 +433,38 @@ class PredictiveMaintenanceEngine:
         logger.info(f"Generated {len(recommendations)} maintenance recommendations")
         return recommendations
     
-    def _create_health_based_recommendation(self, status: EquipmentStatus) -> MaintenanceRecommendation:
+    def _cached_evaluations(self, equipment_id: str) -> Tuple[Dict[str, Tuple], Dict[str, Any]]:
+        """Get the LRU cache entry of one equipment, evicting the oldest when full"""
+        entry = self._last_evaluations.get(equipment_id)
+        if entry is None:
+            entry = self._last_evaluations[equipment_id] = ({}, {})
+            if len(self._last_evaluations) > _MAX_CACHED_EQUIPMENT:
+                self._last_evaluations.popitem(last=False)
+        else:
+            self._last_evaluations.move_to_end(equipment_id)
+        return entry
+    
+    def _reissue(self, rec: MaintenanceRecommendation, now: datetime) -> MaintenanceRecommendation:
+        """Copy a cached recommendation with a fresh id, timestamp and failure date"""
+        failure_date = rec.predicted_failure_date
+        return replace(
+            rec,
+            recommendation_id=f"{rec.recommendation_id.rpartition('_')[0]}_{next(self._rec_counter)}",
+            timestamp=now,
+            predicted_failure_date=failure_date + (now - rec.timestamp) if failure_date else None
+        )
+    
+    def _create_health_based_recommendation(self, status: EquipmentStatus, now: datetime) -> MaintenanceRecommendation:
         """Create recommendation based on health score"""
         
-        if status.health_score < 30:
-            priority = 1
-            maintenance_type = MaintenanceType.CORRECTIVE
-            description = f"Critical health status ({status.health_score:.1f}%) - immediate attention required"
-            actions = [
-                "Perform emergency inspection",
-                "Schedule immediate maintenance",
-                "Prepare replacement parts"
-            ]
-        elif status.health_score < 50:
-            priority = 2
-            maintenance_type = MaintenanceType.PREDICTIVE
-            description = f"Poor health status ({status.health_score:.1f}%) - maintenance recommended soon"
-            actions = [
-                "Schedule maintenance within 1 week",
-                "Monitor closely",
-                "Order replacement parts"
-            ]
-        else:
-            priority = 3
-            maintenance_type = MaintenanceType.CONDITION_BASED
-            description = f"Fair health status ({status.health_score:.1f}%) - plan maintenance"
-            actions = [
-                "Schedule routine maintenance",
-                "Continue monitoring"
-            ]
+        idx = bisect.bisect_right(_HEALTH_BINS, status.health_score)
+        priority, maintenance_type, actions, description_fmt = _HEALTH_TEMPLATES[idx]
+        description = description_fmt.format(health_score=status.health_score)
         
         return MaintenanceRecommendation(
             equipment_id=status.equipment_id,
-            recommendation_id=f"REC_{datetime.now().timestamp()}",
-            timestamp=datetime.now(),
+            recommendation_id=f"REC_{next(self._rec_counter)}",
+            timestamp=now,
             maintenance_type=maintenance_type,
             priority=priority,
             predicted_failure_date=None,
@@ -194,125 +476,110 @@ class PredictiveMaintenanceEngine:
             estimated_downtime=120
         )
     
-    def _check_time_based_maintenance(self, status: EquipmentStatus) -> Optional[MaintenanceRecommendation]:
+    def _check_time_based_maintenance(self, status: EquipmentStatus, now: datetime) -> Optional[MaintenanceRecommendation]:
         """Check if time-based maintenance is due"""
         
         if status.last_maintenance is None:
             return None
         
-        days_since_maintenance = (datetime.now() - status.last_maintenance).days
+        days_since_maintenance = (now - status.last_maintenance).days
         
         # Example: Maintenance every 180 days
         if days_since_maintenance > 180:
             return MaintenanceRecommendation(
                 equipment_id=status.equipment_id,
-                recommendation_id=f"REC_TIME_{datetime.now().timestamp()}",
-                timestamp=datetime.now(),
+                recommendation_id=f"REC_TIME_{next(self._rec_counter)}",
+                timestamp=now,
                 maintenance_type=MaintenanceType.PREVENTIVE,
                 priority=3,
                 predicted_failure_date=None,
                 remaining_useful_life=None,
                 confidence=1.0,
                 description=f"Scheduled maintenance overdue by {days_since_maintenance - 180} days",
-                recommended_actions=[
-                    "Perform scheduled maintenance",
-                    "Replace worn components",
-                    "Lubrication service"
-                ],
+                recommended_actions=_TIME_BASED_ACTIONS,
                 estimated_cost=2000.0,
                 estimated_downtime=60
             )
         
         return None
     
-    def _analyze_sensor_trends(self, status: EquipmentStatus) -> List[MaintenanceRecommendation]:
+    def _analyze_sensor_trends(self, status: EquipmentStatus, now: datetime) -> List[MaintenanceRecommendation]:
         """Analyze sensor data trends for anomalies"""
         recommendations = []
         
-        # Check vibration levels
-        if "vibration" in status.sensor_readings:
-            vibration = status.sensor_readings["vibration"]
-            if vibration > 10.0:  # mm/s threshold
-                rec = MaintenanceRecommendation(
-                    equipment_id=status.equipment_id,
-                    recommendation_id=f"REC_VIB_{datetime.now().timestamp()}",
-                    timestamp=datetime.now(),
-                    maintenance_type=MaintenanceType.CONDITION_BASED,
-                    priority=2,
-                    predicted_failure_date=datetime.now() + timedelta(days=14),
-                    remaining_useful_life=14,
-                    confidence=0.80,
-                    description=f"Excessive vibration detected ({vibration:.2f} mm/s)",
-                    recommended_actions=[
-                        "Check bearing condition",
-                        "Verify alignment",
-                        "Balance rotating components",
-                        "Inspect mounting"
-                    ],
-                    estimated_cost=3000.0,
-                    estimated_downtime=180
-                )
-                recommendations.append(rec)
-        
-        # Check temperature
-        if "temperature" in status.sensor_readings:
-            temperature = status.sensor_readings["temperature"]
-            if temperature > 80.0:  # °C threshold
-                rec = MaintenanceRecommendation(
-                    equipment_id=status.equipment_id,
-                    recommendation_id=f"REC_TEMP_{datetime.now().timestamp()}",
-                    timestamp=datetime.now(),
-                    maintenance_type=MaintenanceType.CONDITION_BASED,
-                    priority=2,
-                    predicted_failure_date=datetime.now() + timedelta(days=7),
-                    remaining_useful_life=7,
-                    confidence=0.75,
-                    description=f"Elevated temperature ({temperature:.1f}°C)",
-                    recommended_actions=[
-                        "Check cooling system",
-                        "Verify lubrication",
-                        "Clean heat exchanger",
-                        "Check for overload"
-                    ],
-                    estimated_cost=1500.0,
-                    estimated_downtime=90
-                )
-                recommendations.append(rec)
-        
-        # Check current draw (for motors)
-        if "current" in status.sensor_readings:
-            current = status.sensor_readings["current"]
-            # Assuming rated current is known
-            rated_current = 10.0  # A
-            if current > rated_current * 1.2:
-                rec = MaintenanceRecommendation(
-                    equipment_id=status.equipment_id,
-                    recommendation_id=f"REC_CURR_{datetime.now().timestamp()}",
-                    timestamp=datetime.now(),
-                    maintenance_type=MaintenanceType.CONDITION_BASED,
-                    priority=1,
-                    predicted_failure_date=datetime.now() + timedelta(days=3),
-                    remaining_useful_life=3,
-                    confidence=0.85,
-                    description=f"Overcurrent condition ({current:.2f}A, rated {rated_current}A)",
-                    recommended_actions=[
-                        "Check for mechanical binding",
-                        "Verify load conditions",
-                        "Inspect motor windings",
-                        "Check for phase imbalance"
-                    ],
-                    estimated_cost=4000.0,
-                    estimated_downtime=240
-                )
-                recommendations.append(rec)
+        for sensor, template in _SENSOR_TREND_TEMPLATES.items():
+            if sensor not in status.sensor_readings:
+                continue
+            
+            value = status.sensor_readings[sensor]
+            if value > template[0]:
+                recommendations.append(self._create_sensor_trend_recommendation(status, sensor, value, now))
+        
+        return recommendations
+    
+    def analyze_sensor_trends_batch(self, statuses: List[EquipmentStatus]) -> List[List[MaintenanceRecommendation]]:
+        """
+        Analyze sensor data trends for a fleet of equipment
+        
+        Vectorized equivalent of _analyze_sensor_trends. All thresholds are
+        compared in one pass; recommendations are only built for triggers.
+        
+        Args:
+            statuses: List of equipment statuses
+        
+        Returns:
+            List of recommendations per status
+        """
+        now = datetime.now()
+        readings = np.full((len(statuses), len(_SENSOR_TREND_NAMES)), np.nan)
+        
+        for i, status in enumerate(statuses):
+            for j, sensor in enumerate(_SENSOR_TREND_NAMES):
+                readings[i, j] = status.sensor_readings.get(sensor, np.nan)
+        
+        # NaN compares False, so missing sensors never trigger
+        triggers = readings > _SENSOR_TREND_THRESHOLDS
+        
+        recommendations = [[] for _ in statuses]
+        for i, j in np.argwhere(triggers):
+            sensor = _SENSOR_TREND_NAMES[j]
+            recommendations[i].append(
+                self._create_sensor_trend_recommendation(statuses[i], sensor, readings[i, j], now)
+            )
         
         return recommendations
     
-    def _predict_remaining_useful_life(self, status: EquipmentStatus) -> Optional[MaintenanceRecommendation]:
-        """Predict remaining useful life using degradation models"""
+    def _create_sensor_trend_recommendation(
+        self,
+        status: EquipmentStatus,
+        sensor: str,
+        value: float,
+        now: datetime
+    ) -> MaintenanceRecommendation:
+        """Create recommendation for a sensor reading above its threshold"""
+        (_, priority, confidence, actions, cost,
+         downtime, rul_days, id_prefix, description_fmt) = _SENSOR_TREND_TEMPLATES[sensor]
+        
+        return MaintenanceRecommendation(
+            equipment_id=status.equipment_id,
+            recommendation_id=f"{id_prefix}_{next(self._rec_counter)}",
+            timestamp=now,
+            maintenance_type=MaintenanceType.CONDITION_BASED,
+            priority=priority,
+            predicted_failure_date=now + timedelta(days=rul_days),
+            remaining_useful_life=rul_days,
+            confidence=confidence,
+            description=description_fmt.format(value=value, rated_current=_RATED_CURRENT),
+            recommended_actions=actions,
+            estimated_cost=cost,
+            estimated_downtime=downtime
+        )
+    
+    def _estimate_remaining_useful_life(self, status: EquipmentStatus) -> Optional[int]:
+        """Estimate remaining useful life in days using degradation models"""
         
         # Determine equipment type from ID
-        equipment_type = status.equipment_id.split("_")[0].lower()
+        equipment_type = _equipment_type(status.equipment_id)
         
         if equipment_type not in self.degradation_models:
             return None
@@ -321,7 +588,18 @@ class PredictiveMaintenanceEngine:
         model_func = self.degradation_models[equipment_type]
         
         # Predict RUL
-        rul_days = model_func(status)
+        readings = status.sensor_readings
+        rul_days = model_func(
+            float(status.health_score),
+            float(status.operating_hours),
+            int(status.cycles_count),
+            float(readings.get("temperature", 40)),
+            float(readings.get("vibration", 0))
+        )
+        return rul_days
+    
+    def _create_rul_recommendation(self, status: EquipmentStatus, rul_days: int, now: datetime) -> MaintenanceRecommendation:
+        """Create recommendation from a remaining useful life estimate"""
         
         if rul_days < 30:
             priority = 1
@@ -330,12 +608,12 @@ class PredictiveMaintenanceEngine:
         else:
             priority = 3
         
-        failure_date = datetime.now() + timedelta(days=rul_days)
+        failure_date = now + timedelta(days=rul_days)
         
         return MaintenanceRecommendation(
             equipment_id=status.equipment_id,
-            recommendation_id=f"REC_RUL_{datetime.now().timestamp()}",
-            timestamp=datetime.now(),
+            recommendation_id=f"REC_RUL_{next(self._rec_counter)}",
+            timestamp=now,
             maintenance_type=MaintenanceType.PREDICTIVE,
             priority=priority,
             predicted_failure_date=failure_date,
@@ -351,111 +629,60 @@ class PredictiveMaintenanceEngine:
             estimated_downtime=150
         )
     
-    def _create_anomaly_recommendation(self, status: EquipmentStatus) -> MaintenanceRecommendation:
+    def predict_remaining_useful_life_batch(self, statuses: List[EquipmentStatus]) -> np.ndarray:
+        """
+        Predict remaining useful life for a fleet of equipment
+        
+        Args:
+            statuses: List of equipment statuses
+        
+        Returns:
+            Array of RUL days, one per status (-1 for unknown equipment types)
+        """
+        n = len(statuses)
+        types = np.empty(n, dtype=np.int8)
+        op_hours = np.empty(n, dtype=np.float64)
+        health = np.empty(n, dtype=np.float64)
+        temp = np.empty(n, dtype=np.float64)
+        vib = np.empty(n, dtype=np.float64)
+        cycles = np.empty(n, dtype=np.int64)
+        
+        for i, status in enumerate(statuses):
+            equipment_type = _equipment_type(status.equipment_id)
+            types[i] = EQUIPMENT_TYPE_CODES.get(equipment_type, -1)
+            op_hours[i] = status.operating_hours
+            health[i] = status.health_score
+            temp[i] = status.sensor_readings.get("temperature", 40)
+            vib[i] = status.sensor_readings.get("vibration", 0)
+            cycles[i] = status.cycles_count
+        
+        return _rul_batch(types, op_hours, health, temp, vib, cycles)
+    
+    def _create_anomaly_recommendation(self, status: EquipmentStatus, now: datetime) -> MaintenanceRecommendation:
         """Create recommendation based on anomaly detection"""
         
         return MaintenanceRecommendation(
             equipment_id=status.equipment_id,
-            recommendation_id=f"REC_ANOM_{datetime.now().timestamp()}",
-            timestamp=datetime.now(),
+            recommendation_id=f"REC_ANOM_{next(self._rec_counter)}",
+            timestamp=now,
             maintenance_type=MaintenanceType.CONDITION_BASED,
             priority=2,
             predicted_failure_date=None,
             remaining_useful_life=None,
             confidence=status.anomaly_score,
             description=f"Abnormal behavior detected (anomaly score: {status.anomaly_score:.2f})",
-            recommended_actions=[
-                "Investigate unusual patterns",
-                "Perform detailed inspection",
-                "Review recent operational changes",
-                "Monitor closely"
-            ],
+            recommended_actions=_ANOMALY_ACTIONS,
             estimated_cost=1000.0,
             estimated_downtime=30
         )
     
-    # Degradation models for different equipment types
-    
-    def _motor_degradation_model(self, status: EquipmentStatus) -> int:
-        """Predict motor remaining useful life"""
-        
-        # Factors affecting motor life
-        base_life = 36500  # days (100 years new motor)
-        
-        # Reduce based on operating hours
-        life_reduction = status.operating_hours / 100  # days
-        
-        # Reduce based on health score
-        health_factor = status.health_score / 100
-        
-        # Reduce based on temperature
-        temp = status.sensor_readings.get("temperature", 40)
-        temp_factor = max(0, 1 - (temp - 40) / 100)  # Reduce life at high temp
-        
-        rul = int(base_life * health_factor * temp_factor - life_reduction)
-        
-        return max(1, rul)
-    
-    def _pump_degradation_model(self, status: EquipmentStatus) -> int:
-        """Predict pump remaining useful life"""
-        base_life = 18250  # days (50 years)
-        
-        health_factor = status.health_score / 100
-        cycles_factor = max(0, 1 - status.cycles_count / 1000000)
-        
-        rul = int(base_life * health_factor * cycles_factor)
-        
-        return max(1, rul)
-    
-    def _valve_degradation_model(self, status: EquipmentStatus) -> int:
-        """Predict valve remaining useful life"""
-        base_life = 7300  # days (20 years)
-        
-        health_factor = status.health_score / 100
-        cycles_factor = max(0, 1 - status.cycles_count / 100000)
-        
-        rul = int(base_life * health_factor * cycles_factor)
-        
-        return max(1, rul)
-    
-    def _sensor_degradation_model(self, status: EquipmentStatus) -> int:
-        """Predict sensor remaining useful life"""
-        base_life = 3650  # days (10 years)
-        
-        health_factor = status.health_score / 100
-        
-        rul = int(base_life * health_factor)
-        
-        return max(1, rul)
-    
-    def _bearing_degradation_model(self, status: EquipmentStatus) -> int:
-        """Predict bearing remaining useful life"""
-        base_life = 1825  # days (5 years)
-        
-        health_factor = status.health_score / 100
-        
-        # Vibration impact
-        vibration = status.sensor_readings.get("vibration", 0)
-        vib_factor = max(0, 1 - vibration / 50)
-        
-        rul = int(base_life * health_factor * vib_factor)
-        
-        return max(1, rul)
-    
     def calculate_health_score(self, status: EquipmentStatus) -> float:
         """Calculate overall health score"""
         
         scores = []
         
         # Operating hours score (newer is better)
-        if status.operating_hours < 1000:
-            scores.append(100)
-        elif status.operating_hours < 5000:
-            scores.append(90)
-        elif status.operating_hours < 10000:
-            scores.append(70)
-        else:
-            scores.append(50)
+        scores.append(_OP_SCORES_LIST[bisect.bisect_right(_OP_BINS_LIST, status.operating_hours)])
         
         # Sensor-based scores
         if "vibration" in status.sensor_readings:
@@ -473,10 +700,43 @@ class PredictiveMaintenanceEngine:
         scores.append(anomaly_impact)
         
         # Average all scores
-        overall_score = np.mean(scores) if scores else 50.0
+        overall_score = (sum(scores) / len(scores)) if scores else 50.0
         
         return overall_score
     
+    def calculate_health_scores_batch(self, statuses: List[EquipmentStatus]) -> np.ndarray:
+        """
+        Calculate health scores for a fleet of equipment
+        
+        Vectorized equivalent of calculate_health_score. Missing sensor
+        readings are marked as NaN so they drop out of the average.
+        
+        Args:
+            statuses: List of equipment statuses
+        
+        Returns:
+            Array of health scores, one per status
+        """
+        n = len(statuses)
+        op = np.empty(n, dtype=np.float64)
+        vib = np.empty(n, dtype=np.float64)
+        temp = np.empty(n, dtype=np.float64)
+        anom = np.empty(n, dtype=np.float64)
+        
+        for i, status in enumerate(statuses):
+            op[i] = status.operating_hours
+            vib[i] = status.sensor_readings.get("vibration", np.nan)
+            temp[i] = status.sensor_readings.get("temperature", np.nan)
+            anom[i] = status.anomaly_score
+        
+        op_score = _OP_SCORES[np.searchsorted(_OP_BINS, op, side="right")]
+        # np.maximum propagates NaN, so missing sensors stay missing
+        vib_score = np.maximum(0, 100 - vib * 5)
+        temp_score = np.maximum(0, 100 - (temp - 40) * 2)
+        anom_score = (1 - anom) * 100
+        
+        return np.nanmean(np.stack([op_score, vib_score, temp_score, anom_score]), axis=0)
+    
     def optimize_maintenance_schedule(
         self, 
         recommendations: List[MaintenanceRecommendation],
@@ -500,13 +760,15 @@ class PredictiveMaintenanceEngine:
         # Sort by priority and RUL
         sorted_recs = sorted(
             recommendations,
-            key=lambda x: (x.priority, x.remaining_useful_life or 999)
+            key=operator.attrgetter("priority", "_rul_key")
         )
         
         schedule = []
         total_cost = 0
         total_downtime = 0
         current_date = datetime.now()
+        week = timedelta(days=7)
+        default_date = current_date + week
         
         for rec in sorted_recs:
             # Check budget constraint
@@ -518,15 +780,15 @@ class PredictiveMaintenanceEngine:
                 continue
             
             # Schedule the maintenance
-            scheduled_date = current_date + timedelta(days=7)
+            scheduled_date = default_date
             if rec.predicted_failure_date:
                 # Schedule before predicted failure
-                scheduled_date = rec.predicted_failure_date - timedelta(days=7)
+                scheduled_date = rec.predicted_failure_date - week
             
             schedule.append({
                 "equipment_id": rec.equipment_id,
                 "scheduled_date": scheduled_date.isoformat(),
-                "maintenance_type": rec.maintenance_type.value,
+                "maintenance_type": MAINTENANCE_TYPE_STR[rec.maintenance_type],
                 "description": rec.description,
                 "actions": rec.recommended_actions,
                 "estimated_cost": rec.estimated_cost,
@@ -575,7 +837,7 @@ if __name__ == "__main__":
     
     for rec in recommendations:
         print(f"Priority {rec.priority}: {rec.description}")
-        print(f"  Type: {rec.maintenance_type.value}")
+        print(f"  Type: {MAINTENANCE_TYPE_STR[rec.maintenance_type]}")
         if rec.remaining_useful_life:
             print(f"  RUL: {rec.remaining_useful_life} days")
         print(f"  Confidence: {rec.confidence * 100:.0f}%")
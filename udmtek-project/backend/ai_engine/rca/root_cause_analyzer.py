@@ -3,12 +3,17 @@ Root Cause Analysis (RCA) AI Engine
 Uses machine learning to identify and diagnose PLC faults automatically
 """
 
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from enum import Enum
 import numpy as np
+from numba import njit
 from datetime import datetime
+import heapq
+import itertools
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +38,7 @@ class FaultCategory(Enum):
     PROCESS = "PROCESS"
 
 
-@dataclass
+@dataclass(slots=True)
 class Fault:
     """Represents a detected fault"""
     fault_id: str
@@ -46,13 +51,19 @@ class Fault:
     root_cause: str
     recommended_actions: List[str]
     confidence: float  # 0.0 to 1.0
+    _cat_str: str = field(init=False, repr=False, compare=False)
+    _sev_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._cat_str = self.category.value
+        self._sev_str = self.severity.value
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "fault_id": self.fault_id,
             "timestamp": self.timestamp.isoformat(),
-            "category": self.category.value,
-            "severity": self.severity.value,
+            "category": self._cat_str,
+            "severity": self._sev_str,
             "description": self.description,
             "affected_components": self.affected_components,
             "symptoms": self.symptoms,
@@ -62,7 +73,7 @@ class Fault:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DiagnosticData:
     """Input data for RCA analysis"""
     plc_signals: Dict[str, Any]      # Current PLC signal values
@@ -72,14 +83,59 @@ class DiagnosticData:
     process_parameters: Dict[str, Any] # Process setpoints, etc.
     
     
+# Known PLC error codes: code -> (description, category, severity)
+_ERROR_PATTERNS = {
+    "E001": ("Communication timeout", FaultCategory.COMMUNICATION, FaultSeverity.CRITICAL),
+    "E002": ("Sensor fault", FaultCategory.HARDWARE, FaultSeverity.HIGH),
+    "E003": ("Overload", FaultCategory.PROCESS, FaultSeverity.HIGH),
+    "W001": ("Low battery", FaultCategory.HARDWARE, FaultSeverity.LOW),
+}
+
+
+# Signal names classified as sensors (case-insensitive, no lowercased copy)
+_SENSOR_RE = re.compile("sensor", re.IGNORECASE)
+
+
+@njit(cache=True, fastmath=True)
+def _three_sigma_mask(hist, current):
+    """Flag columns whose current value is more than 3 sigma from the history mean"""
+    n, p = hist.shape
+    out = np.empty(p, dtype=np.bool_)
+    
+    for j in range(p):
+        s = 0.0
+        for i in range(n):
+            s += hist[i, j]
+        mean = s / n
+        
+        s2 = 0.0
+        for i in range(n):
+            d = hist[i, j] - mean
+            s2 += d * d
+        
+        out[j] = abs(current[j] - mean) > 3.0 * np.sqrt(s2 / n)
+    
+    return out
+
+
 class RootCauseAnalyzer:
     """
     AI-powered Root Cause Analysis engine
     Analyzes PLC data to identify fault root causes automatically
     """
     
+    # Severity rank (lower is more severe)
+    _SEV_RANK = {
+        FaultSeverity.CRITICAL: 0,
+        FaultSeverity.HIGH: 1,
+        FaultSeverity.MEDIUM: 2,
+        FaultSeverity.LOW: 3,
+        FaultSeverity.INFO: 4
+    }
+    
     def __init__(self):
         self.fault_database = self._initialize_fault_database()
+        self._fault_counter = itertools.count()
         self.ml_model = None  # TODO: Load trained ML model
         logger.info("Root Cause Analyzer initialized")
     
@@ -213,24 +269,18 @@ class RootCauseAnalyzer:
         """
         logger.info("Starting root cause analysis")
         
-        faults = []
-        
-        # 1. Pattern-based detection
-        pattern_faults = self._pattern_based_detection(data)
-        faults.extend(pattern_faults)
-        
-        # 2. Statistical anomaly detection
-        anomaly_faults = self._anomaly_detection(data)
-        faults.extend(anomaly_faults)
+        now = datetime.now()
         
-        # 3. Sequence analysis
-        sequence_faults = self._sequence_analysis(data)
-        faults.extend(sequence_faults)
-        
-        # 4. ML-based prediction (if model available)
-        if self.ml_model:
-            ml_faults = self._ml_prediction(data)
-            faults.extend(ml_faults)
+        faults = list(itertools.chain(
+            # 1. Pattern-based detection
+            self._pattern_based_detection(data, now=now),
+            # 2. Statistical anomaly detection
+            self._anomaly_detection(data, now=now),
+            # 3. Sequence analysis
+            self._sequence_analysis(data, now=now),
+            # 4. ML-based prediction (if model available)
+            self._ml_prediction(data) if self.ml_model else ()
+        ))
         
         # 5. Correlation analysis
         correlated_faults = self._correlation_analysis(faults, data)
@@ -239,18 +289,24 @@ class RootCauseAnalyzer:
         
         return correlated_faults
     
-    def _pattern_based_detection(self, data: DiagnosticData) -> List[Fault]:
+    def _pattern_based_detection(self, data: DiagnosticData, now: datetime) -> List[Fault]:
         """Detect faults using predefined patterns"""
         faults = []
         
+        # Recent values per signal, collected in one pass over the history
+        recent_values = defaultdict(list)
+        for record in data.historical_data[-10:]:
+            for name, value in record.items():
+                recent_values[name].append(value)
+        
         # Check for sensor failures
         for signal_name, signal_value in data.plc_signals.items():
-            if "sensor" in signal_name.lower():
+            if _SENSOR_RE.search(signal_name):
                 # Check if value is stuck
-                if self._is_value_stuck(signal_name, signal_value, data.historical_data):
+                if self._is_value_stuck(recent_values.get(signal_name, ())):
                     fault = Fault(
-                        fault_id=f"FAULT_{datetime.now().timestamp()}",
-                        timestamp=datetime.now(),
+                        fault_id=f"FAULT_{next(self._fault_counter)}",
+                        timestamp=now,
                         category=FaultCategory.HARDWARE,
                         severity=FaultSeverity.HIGH,
                         description=f"Sensor {signal_name} failure detected",
@@ -269,51 +325,58 @@ class RootCauseAnalyzer:
         
         # Check error codes
         for error_code in data.error_codes:
-            fault = self._interpret_error_code(error_code)
+            fault = self._interpret_error_code(error_code, now=now)
             if fault:
                 faults.append(fault)
         
         return faults
     
-    def _anomaly_detection(self, data: DiagnosticData) -> List[Fault]:
+    def _anomaly_detection(self, data: DiagnosticData, now: datetime) -> List[Fault]:
         """Detect anomalies using statistical methods"""
         faults = []
         
         # Example: Detect abnormal process parameters
-        for param_name, param_value in data.process_parameters.items():
-            # Calculate statistical deviation
-            historical_values = [
-                record.get(param_name, 0) 
-                for record in data.historical_data
-            ]
-            
-            if len(historical_values) > 10:
-                mean = np.mean(historical_values)
-                std = np.std(historical_values)
-                
-                # 3-sigma rule
-                if abs(param_value - mean) > 3 * std:
-                    fault = Fault(
-                        fault_id=f"FAULT_{datetime.now().timestamp()}",
-                        timestamp=datetime.now(),
-                        category=FaultCategory.PROCESS,
-                        severity=FaultSeverity.MEDIUM,
-                        description=f"Abnormal value detected for {param_name}",
-                        affected_components=[param_name],
-                        symptoms=[f"Value {param_value} deviates from normal range"],
-                        root_cause="Process parameter out of statistical control",
-                        recommended_actions=[
-                            "Investigate process conditions",
-                            "Check control loop tuning",
-                            "Verify setpoint accuracy"
-                        ],
-                        confidence=0.75
-                    )
-                    faults.append(fault)
+        param_names = list(data.process_parameters)
+        if not param_names or len(data.historical_data) <= 10:
+            return faults
+        
+        # Historical values as one (records x parameters) matrix, kept in float64
+        # like the current values: rounding only the history to float32 flags
+        # constant parameters (e.g. 101.3) as 3-sigma outliers
+        hist = np.fromiter(
+            (record.get(name, 0) for record in data.historical_data for name in param_names),
+            dtype=np.float64,
+            count=len(data.historical_data) * len(param_names)
+        ).reshape(-1, len(param_names))
+        current = np.array([data.process_parameters[name] for name in param_names], dtype=np.float64)
+        
+        # 3-sigma rule, evaluated for all parameters at once
+        outliers = np.nonzero(_three_sigma_mask(hist, current))[0]
+        
+        for j in outliers:
+            param_name = param_names[j]
+            param_value = data.process_parameters[param_name]
+            fault = Fault(
+                fault_id=f"FAULT_{next(self._fault_counter)}",
+                timestamp=now,
+                category=FaultCategory.PROCESS,
+                severity=FaultSeverity.MEDIUM,
+                description=f"Abnormal value detected for {param_name}",
+                affected_components=[param_name],
+                symptoms=[f"Value {param_value} deviates from normal range"],
+                root_cause="Process parameter out of statistical control",
+                recommended_actions=[
+                    "Investigate process conditions",
+                    "Check control loop tuning",
+                    "Verify setpoint accuracy"
+                ],
+                confidence=0.75
+            )
+            faults.append(fault)
         
         return faults
     
-    def _sequence_analysis(self, data: DiagnosticData) -> List[Fault]:
+    def _sequence_analysis(self, data: DiagnosticData, now: datetime) -> List[Fault]:
         """Analyze sequence of events for logic errors"""
         faults = []
         
@@ -324,8 +387,8 @@ class RootCauseAnalyzer:
             
             if len(set(alarm_codes)) == 1 and len(alarm_codes) > 3:
                 fault = Fault(
-                    fault_id=f"FAULT_{datetime.now().timestamp()}",
-                    timestamp=datetime.now(),
+                    fault_id=f"FAULT_{next(self._fault_counter)}",
+                    timestamp=now,
                     category=FaultCategory.SOFTWARE,
                     severity=FaultSeverity.MEDIUM,
                     description="Repeating alarm pattern detected",
@@ -358,27 +421,32 @@ class RootCauseAnalyzer:
         if len(faults) <= 1:
             return faults
         
-        # Group related faults
-        fault_groups = self._group_related_faults(faults)
+        # Group related faults (a pair needs a single direct check)
+        if len(faults) == 2:
+            if not self._are_faults_related(*faults):
+                return faults
+            fault_groups = [faults]
+        else:
+            fault_groups = self._group_related_faults(faults)
         
         # For each group, identify the primary root cause
         primary_faults = []
         
         for group in fault_groups:
-            # Sort by severity and confidence
-            sorted_group = sorted(
+            # Top 3 by severity and confidence (no full sort needed)
+            top_faults = heapq.nsmallest(
+                3,
                 group,
-                key=lambda f: (f.severity.value, f.confidence),
-                reverse=True
+                key=lambda f: (self._SEV_RANK[f.severity], -f.confidence)
             )
             
-            primary_fault = sorted_group[0]
+            primary_fault = top_faults[0]
             
             # Add related faults as additional info
-            if len(sorted_group) > 1:
-                primary_fault.description += f" (with {len(sorted_group)-1} related faults)"
+            if len(group) > 1:
+                primary_fault.description += f" (with {len(group)-1} related faults)"
                 primary_fault.symptoms.extend([
-                    f"Related: {f.description}" for f in sorted_group[1:3]
+                    f"Related: {f.description}" for f in top_faults[1:]
                 ])
             
             primary_faults.append(primary_fault)
@@ -386,29 +454,52 @@ class RootCauseAnalyzer:
         return primary_faults
     
     def _group_related_faults(self, faults: List[Fault]) -> List[List[Fault]]:
-        """Group faults that are likely related"""
-        groups = []
-        assigned = set()
-        
-        for i, fault1 in enumerate(faults):
-            if i in assigned:
-                continue
-            
-            group = [fault1]
-            assigned.add(i)
-            
-            for j, fault2 in enumerate(faults[i+1:], start=i+1):
-                if j in assigned:
-                    continue
-                
-                # Check if faults are related
-                if self._are_faults_related(fault1, fault2):
-                    group.append(fault2)
-                    assigned.add(j)
-            
-            groups.append(group)
+        """
+        Group faults that are likely related
         
-        return groups
+        Faults sharing a category or component, or occurring within 5
+        minutes of each other, are merged transitively with a union-find.
+        """
+        parent = list(range(len(faults)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        def union(i: int, j: int):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+        
+        cats, ts, comp_sets = self._build_fault_soa(faults)
+        
+        # Same category / overlapping components
+        first_seen = {}
+        for i in range(len(faults)):
+            union(first_seen.setdefault(("category", cats[i]), i), i)
+            for c in comp_sets[i]:
+                union(first_seen.setdefault(("component", c), i), i)
+        
+        # Time proximity (within 5 minutes): chaining neighbours in time order
+        by_time = np.argsort(ts, kind="stable")
+        close = np.diff(ts[by_time]) < 300
+        for k in np.nonzero(close)[0].tolist():
+            union(int(by_time[k]), int(by_time[k + 1]))
+        
+        groups = {}
+        for i, fault in enumerate(faults):
+            groups.setdefault(find(i), []).append(fault)
+        
+        return list(groups.values())
+    
+    def _build_fault_soa(self, faults: List[Fault]) -> Tuple[List[FaultCategory], np.ndarray, List[frozenset]]:
+        """Columnar view of the fields used for fault correlation"""
+        cats = [f.category for f in faults]
+        ts = np.fromiter((f.timestamp.timestamp() for f in faults), dtype=np.float64, count=len(faults))
+        comp_sets = [frozenset(f.affected_components) for f in faults]
+        return cats, ts, comp_sets
     
     def _are_faults_related(self, fault1: Fault, fault2: Fault) -> bool:
         """Determine if two faults are related"""
@@ -428,72 +519,58 @@ class RootCauseAnalyzer:
         
         return False
     
-    def _is_value_stuck(self, signal_name: str, current_value: Any, history: List[Dict]) -> bool:
+    def _is_value_stuck(self, recent_values: Sequence[Any]) -> bool:
         """Check if a signal value is stuck"""
-        recent_values = [
-            record.get(signal_name, None)
-            for record in history[-10:]
-            if signal_name in record
-        ]
-        
         if len(recent_values) < 5:
             return False
         
-        # Check if all values are the same
-        return len(set(recent_values)) == 1
+        # Check if all values are the same (short-circuits on first change)
+        first = recent_values[0]
+        return all(v == first for v in recent_values)
     
-    def _interpret_error_code(self, error_code: str) -> Optional[Fault]:
+    def _interpret_error_code(self, error_code: str, now: datetime) -> Optional[Fault]:
         """Interpret PLC error codes"""
-        error_patterns = {
-            "E001": ("Communication timeout", FaultCategory.COMMUNICATION, FaultSeverity.CRITICAL),
-            "E002": ("Sensor fault", FaultCategory.HARDWARE, FaultSeverity.HIGH),
-            "E003": ("Overload", FaultCategory.PROCESS, FaultSeverity.HIGH),
-            "W001": ("Low battery", FaultCategory.HARDWARE, FaultSeverity.LOW),
-        }
-        
-        if error_code in error_patterns:
-            desc, category, severity = error_patterns[error_code]
-            
-            return Fault(
-                fault_id=f"FAULT_{error_code}_{datetime.now().timestamp()}",
-                timestamp=datetime.now(),
-                category=category,
-                severity=severity,
-                description=f"Error code {error_code}: {desc}",
-                affected_components=["PLC"],
-                symptoms=[f"Error code {error_code} reported"],
-                root_cause=desc,
-                recommended_actions=["Refer to PLC manual", "Contact technical support"],
-                confidence=0.90
-            )
-        
-        return None
+        hit = _ERROR_PATTERNS.get(error_code)
+        if hit is None:
+            return None
+        
+        desc, category, severity = hit
+        
+        return Fault(
+            fault_id=f"FAULT_{error_code}_{next(self._fault_counter)}",
+            timestamp=now,
+            category=category,
+            severity=severity,
+            description=f"Error code {error_code}: {desc}",
+            affected_components=["PLC"],
+            symptoms=[f"Error code {error_code} reported"],
+            root_cause=desc,
+            recommended_actions=["Refer to PLC manual", "Contact technical support"],
+            confidence=0.90
+        )
     
     def generate_report(self, faults: List[Fault]) -> Dict[str, Any]:
         """Generate comprehensive RCA report"""
         
-        # Group by severity
-        by_severity = {}
-        for fault in faults:
-            severity = fault.severity.value
-            if severity not in by_severity:
-                by_severity[severity] = []
-            by_severity[severity].append(fault)
+        # Count by severity
+        sev_counts = Counter(f.severity for f in faults)
+        
+        fault_dicts = [f.to_dict() for f in faults]
         
         # Generate summary
         report = {
             "timestamp": datetime.now().isoformat(),
             "total_faults": len(faults),
             "by_severity": {
-                severity: len(fault_list)
-                for severity, fault_list in by_severity.items()
+                severity.value: sev_counts[severity]
+                for severity in sorted(sev_counts, key=self._SEV_RANK.__getitem__)
             },
             "critical_faults": [
-                f.to_dict() for f in faults
-                if f.severity == FaultSeverity.CRITICAL
+                d for d, f in zip(fault_dicts, faults)
+                if f.severity is FaultSeverity.CRITICAL
             ],
             "recommendations": self._generate_recommendations(faults),
-            "faults": [f.to_dict() for f in faults]
+            "faults": fault_dicts
         }
         
         return report
@@ -4,7 +4,7 @@ Endpoints for uploading and parsing PLC project files
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any
 import logging
 
@@ -18,6 +18,56 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Parsers are reused per model. parse_project/export_to_dict run back to back
+# without awaiting, so requests on the event loop never interleave parser state.
+_PARSERS: Dict[SiemensModel, SiemensSIMATICParser] = {}
+
+
+def _get_siemens_parser(model: SiemensModel) -> SiemensSIMATICParser:
+    """Get the shared parser instance for a Siemens model"""
+    parser = _PARSERS.get(model)
+    if parser is None:
+        parser = _PARSERS.setdefault(model, SiemensSIMATICParser(model))
+    return parser
+
+
+# Model name fragment -> Siemens model (S7-1500 is the default)
+_SIEMENS_MODEL_MAP = {
+    "s7-300": SiemensModel.S7_300,
+    "s7-400": SiemensModel.S7_400,
+    "s7-1200": SiemensModel.S7_1200,
+}
+
+
+def _parse_siemens(content: bytes, model: str) -> Dict[str, Any]:
+    """Parse a Siemens project and export it"""
+    model_lower = model.lower()
+    model_enum = next(
+        (m for key, m in _SIEMENS_MODEL_MAP.items() if key in model_lower),
+        SiemensModel.S7_1500
+    )
+    
+    parser = _get_siemens_parser(model_enum)
+    parser.parse_project(content)
+    return parser.export_to_dict()
+
+
+def _not_implemented(vendor_name: str):
+    """Handler for vendors whose parser is not available yet"""
+    def handler(content: bytes, model: str) -> Dict[str, Any]:
+        raise HTTPException(status_code=501, detail=f"{vendor_name} parser not yet implemented")
+    return handler
+
+
+# Vendor -> handler(content, model) returning the exported project
+_VENDOR_DISPATCH = {
+    "siemens": _parse_siemens,
+    "mitsubishi": _not_implemented("Mitsubishi"),  # MitsubishiParser
+    "rockwell": _not_implemented("Rockwell"),      # RockwellParser
+    "ls": _not_implemented("LS"),                  # LSParser
+    "omron": _not_implemented("Omron"),            # OmronParser
+}
+
 
 @router.post("/upload")
 async def upload_plc_project(
@@ -43,43 +93,13 @@ async def upload_plc_project(
         content = await file.read()
         
         # Select appropriate parser
-        if vendor.lower() == "siemens":
-            model_enum = SiemensModel.S7_1500  # Default
-            if "s7-300" in model.lower():
-                model_enum = SiemensModel.S7_300
-            elif "s7-400" in model.lower():
-                model_enum = SiemensModel.S7_400
-            elif "s7-1200" in model.lower():
-                model_enum = SiemensModel.S7_1200
-            
-            parser = SiemensSIMATICParser(model_enum)
-            blocks = parser.parse_project(content)
-            result = parser.export_to_dict()
-            
-        elif vendor.lower() == "mitsubishi":
-            # parser = MitsubishiParser()
-            # blocks = parser.parse_project(content)
-            raise HTTPException(status_code=501, detail="Mitsubishi parser not yet implemented")
-            
-        elif vendor.lower() == "rockwell":
-            # parser = RockwellParser()
-            # blocks = parser.parse_project(content)
-            raise HTTPException(status_code=501, detail="Rockwell parser not yet implemented")
-            
-        elif vendor.lower() == "ls":
-            # parser = LSParser()
-            # blocks = parser.parse_project(content)
-            raise HTTPException(status_code=501, detail="LS parser not yet implemented")
-            
-        elif vendor.lower() == "omron":
-            # parser = OmronParser()
-            # blocks = parser.parse_project(content)
-            raise HTTPException(status_code=501, detail="Omron parser not yet implemented")
-            
-        else:
+        handler = _VENDOR_DISPATCH.get(vendor.lower())
+        if handler is None:
             raise HTTPException(status_code=400, detail=f"Unsupported vendor: {vendor}")
         
-        return JSONResponse(content={
+        result = handler(content, model)
+        
+        return ORJSONResponse(content={
             "status": "success",
             "filename": file.filename,
             "vendor": vendor,
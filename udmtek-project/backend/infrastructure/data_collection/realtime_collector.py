@@ -4,13 +4,38 @@ Collects data from PLCs and sensors in real-time
 """
 
 import asyncio
+import inspect
 import logging
 from typing import Dict, Any, Callable
 from datetime import datetime
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
+# Simulated PLC layout: plc -> (cpu_load range, scan_time range, {signal: range})
+_SIMULATED_PLCS = {
+    "PLC_001": ((30, 80), (5, 15), {
+        "temperature_1": (60, 80),
+        "pressure_1": (95, 105),
+        "motor_speed": (1400, 1600),
+    }),
+    "PLC_002": ((40, 90), (4, 12), {
+        "temperature_2": (55, 75),
+        "flow_rate": (140, 160),
+    }),
+}
+
+# Flattened sample ranges in the order values are read back in _collect_data
+_SAMPLE_RANGES = np.array([
+    value_range
+    for cpu_load, scan_time, signals in _SIMULATED_PLCS.values()
+    for value_range in (cpu_load, scan_time, *signals.values())
+], dtype=np.float64)
+_SAMPLE_LOWS = _SAMPLE_RANGES[:, 0].copy()
+_SAMPLE_SPANS = _SAMPLE_RANGES[:, 1] - _SAMPLE_RANGES[:, 0]
+
+
 class RealtimeCollector:
     """
     Real-time data collector for PLC and sensor data
@@ -20,6 +45,8 @@ class RealtimeCollector:
         self.is_running = False
         self.data_handlers = []
         self.collection_interval = 1.0  # seconds
+        self._rng = np.random.default_rng()
+        self._samples = np.empty(len(_SAMPLE_LOWS), dtype=np.float64)
         logger.info("Real-time Collector initialized")
     
     def register_handler(self, handler: Callable):
@@ -32,26 +59,50 @@ class RealtimeCollector:
         self.is_running = True
         logger.info("🚀 Starting real-time data collection...")
         
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        
         try:
             while self.is_running:
                 # Collect data
                 data = await self._collect_data()
                 
-                # Notify all handlers
-                for handler in self.data_handlers:
-                    try:
-                        await handler(data)
-                    except Exception as e:
-                        logger.error(f"Error in handler {handler.__name__}: {str(e)}")
+                # Notify all handlers concurrently
+                await self._notify_handlers(data)
                 
-                # Wait before next collection
-                await asyncio.sleep(self.collection_interval)
+                # Wait until the next tick deadline (monotonic, no drift)
+                next_tick += self.collection_interval
+                delay = next_tick - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    # Overran the interval: resume cadence from now
+                    next_tick = loop.time()
                 
         except Exception as e:
             logger.error(f"Error in data collection: {str(e)}")
         finally:
             logger.info("Real-time data collection stopped")
     
+    async def _notify_handlers(self, data: Dict[str, Any]):
+        """Run all handlers on one tick; a failing handler never stops the others"""
+        pending = []
+        for handler in self.data_handlers:
+            try:
+                result = handler(data)
+            except Exception as e:
+                logger.error(f"Error in handler {handler.__name__}: {str(e)}")
+                continue
+            
+            # Sync handlers have already run; coroutines are awaited together
+            if inspect.isawaitable(result):
+                pending.append((handler, result))
+        
+        results = await asyncio.gather(*(result for _, result in pending), return_exceptions=True)
+        for (handler, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error in handler {handler.__name__}: {str(result)}")
+    
     async def stop(self):
         """Stop real-time data collection"""
         self.is_running = False
@@ -67,36 +118,28 @@ class RealtimeCollector:
         # TODO: Implement actual data collection from PLCs
         # This is a placeholder that simulates data
         
-        import random
+        # Draw every simulated value for this tick in one vectorized call
+        samples = self._rng.random(out=self._samples)
+        samples *= _SAMPLE_SPANS
+        samples += _SAMPLE_LOWS
+        values = iter(samples.tolist())
         
         data = {
             "timestamp": datetime.now().isoformat(),
             "plc_data": {
-                "PLC_001": {
-                    "status": "running",
-                    "cpu_load": random.uniform(30, 80),
-                    "scan_time": random.uniform(5, 15),
-                    "signals": {
-                        "temperature_1": random.uniform(60, 80),
-                        "pressure_1": random.uniform(95, 105),
-                        "motor_speed": random.uniform(1400, 1600),
-                    }
-                },
-                "PLC_002": {
+                plc_id: {
                     "status": "running",
-                    "cpu_load": random.uniform(40, 90),
-                    "scan_time": random.uniform(4, 12),
-                    "signals": {
-                        "temperature_2": random.uniform(55, 75),
-                        "flow_rate": random.uniform(140, 160),
-                    }
+                    "cpu_load": next(values),
+                    "scan_time": next(values),
+                    "signals": {name: next(values) for name in signals}
                 }
+                for plc_id, (_, _, signals) in _SIMULATED_PLCS.items()
             },
             "alarms": []
         }
         
         # Simulate occasional alarm
-        if random.random() < 0.1:
+        if self._rng.random() < 0.1:
             data["alarms"].append({
                 "severity": "WARNING",
                 "message": "Temperature approaching upper limit",
@@ -121,6 +164,6 @@ if __name__ == "__main__":
     collector.register_handler(print_handler)
     
     try:
-        await collector.start()
+        asyncio.run(collector.start())
     except KeyboardInterrupt:
-        await collector.stop()
+        print("Collection stopped")
@@ -0,0 +1,144 @@
+"""
+Batched persistence of real-time PLC ticks
+Buffers collector data and bulk-inserts it with PostgreSQL COPY
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, Index, String
+
+from infrastructure.storage import database
+from infrastructure.storage.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Row layout written to the tick table
+TICK_COLUMNS = ("ts", "plc", "signal", "value")
+
+
+class PLCTick(Base):
+    """One signal sample of one PLC at one collector tick (created by init_db)"""
+    __tablename__ = "plc_ticks"
+    __table_args__ = (Index("ix_plc_ticks_plc_ts", "plc", "ts"),)
+    
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    ts = Column(DateTime, nullable=False)
+    plc = Column(String(64), nullable=False)
+    signal = Column(String(128), nullable=False)
+    value = Column(Float, nullable=False)
+
+
+class BatchingSink:
+    """
+    Collector handler that writes ticks in bulk
+    Rows are flushed every max_rows rows or flush_interval seconds;
+    at most max_queued rows are buffered, the oldest dropped first
+    """
+    
+    def __init__(self, table: str = PLCTick.__tablename__, max_rows: int = 5000,
+                 flush_interval: float = 0.5, max_queued: int = 100000):
+        self.table = table
+        self.max_rows = max_rows
+        self.flush_interval = flush_interval  # seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._dropped = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start the background flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Batching sink started for table {self.table}")
+    
+    async def stop(self):
+        """Flush pending rows and stop the background task"""
+        if self._task is None:
+            return
+        
+        # Sentinel: the flush task writes what it has and exits
+        # (waits for room rather than dropping a queued row)
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        logger.info(f"Batching sink stopped for table {self.table}")
+    
+    async def push(self, data: Dict[str, Any]):
+        """Collector handler: queue one tick for the next bulk insert"""
+        ts = datetime.fromisoformat(data["timestamp"])
+        for plc_id, plc_data in data.get("plc_data", {}).items():
+            for signal, value in plc_data.get("signals", {}).items():
+                self._put((ts, plc_id, signal, float(value)))
+        
+        if self._dropped:
+            logger.warning(f"Tick queue full, dropped {self._dropped} oldest rows")
+            self._dropped = 0
+    
+    def _put(self, row: Tuple):
+        """Queue a row, making room by dropping the oldest one when full"""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._dropped += 1
+        self._queue.put_nowait(row)
+    
+    async def _run(self):
+        """Gather rows into batches and flush them"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            row = await self._queue.get()
+            if row is None:
+                return
+            
+            rows = [row]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+            
+            while len(rows) < self.max_rows:
+                # Take whatever is already queued without waiting
+                while len(rows) < self.max_rows and not self._queue.empty():
+                    row = self._queue.get_nowait()
+                    if row is None:
+                        stopping = True
+                        break
+                    rows.append(row)
+                
+                if stopping or len(rows) >= self.max_rows:
+                    break
+                
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+            
+            await self._flush(rows)
+            
+            if stopping:
+                return
+    
+    async def _flush(self, rows: List[Tuple]):
+        """Write a batch of rows with COPY"""
+        if database.pg_pool is None:
+            logger.warning(f"Database pool not initialized, dropping {len(rows)} tick rows")
+            return
+        
+        try:
+            async with database.pg_pool.acquire() as conn:
+                await conn.copy_records_to_table(self.table, records=rows, columns=TICK_COLUMNS)
+        except Exception as e:
+            logger.error(f"Failed to write {len(rows)} tick rows: {str(e)}")
+
+
+# Global instance
+tick_sink = BatchingSink()
@@ -5,13 +5,23 @@ FastAPI-based REST API server for PLC translation and analysis
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import os
+import orjson
 import uvicorn
-from typing import List
+from typing import Dict
 
 from api.routes import plc_parser, udml_translator, ai_analysis, dashboard
-from infrastructure.data_collection.realtime_collector import RealtimeCollector
+from infrastructure.data_collection.realtime_collector import RealtimeCollector, collector
 from infrastructure.storage.database import init_db, close_db
+from infrastructure.storage.batching_sink import tick_sink
+
+# Collector data is still simulated, so ticks are only collected and
+# persisted when explicitly enabled (UDMTEK_REALTIME_COLLECTION=1)
+REALTIME_COLLECTION = os.getenv("UDMTEK_REALTIME_COLLECTION", "0") == "1"
 
 # Application lifespan management
 @asynccontextmanager
@@ -20,11 +30,21 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting UDMTEK Backend...")
     await init_db()
     print("✅ Database initialized")
+    collector_task = None
+    if REALTIME_COLLECTION:
+        await tick_sink.start()
+        collector.register_handler(tick_sink.push)
+        collector_task = asyncio.create_task(collector.start())
+        print("✅ Real-time collection started")
     
     yield
     
     # Shutdown
     print("🛑 Shutting down UDMTEK Backend...")
+    if collector_task is not None:
+        await collector.stop()
+        await collector_task
+        await tick_sink.stop()
     await close_db()
     print("✅ Database closed")
 
@@ -33,6 +53,7 @@ app = FastAPI(
     title="UDMTEK API",
     description="World's First PLC Translation Technology - AI-powered Industrial Automation Analysis",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -45,6 +66,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger HTTP responses (parser exports, dashboard data)
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Include routers
 app.include_router(plc_parser.router, prefix="/api/v1/parser", tags=["PLC Parser"])
 app.include_router(udml_translator.router, prefix="/api/v1/udml", tags=["UDML Translator"])
@@ -52,20 +76,62 @@ app.include_router(ai_analysis.router, prefix="/api/v1/ai", tags=["AI Analysis"]
 app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
 
 # WebSocket connection manager
+# Per-client outbound queue size; the oldest payload is dropped when full
+_SEND_QUEUE_SIZE = 64
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # Outbound queue and relay task per client, so a slow client
+        # never stalls the broadcaster
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+        self._relays: Dict[WebSocket, asyncio.Task] = {}
+        # Hash of the last payload sent to each client
+        self._last_hash: Dict[WebSocket, int] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=_SEND_QUEUE_SIZE)
+        self.active_connections[websocket] = queue
+        self._relays[websocket] = asyncio.create_task(self._relay(websocket, queue))
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
+        self._last_hash.pop(websocket, None)
+        relay = self._relays.pop(websocket, None)
+        if relay is not None and relay is not asyncio.current_task():
+            relay.cancel()
+
+    async def _relay(self, websocket: WebSocket, queue: asyncio.Queue):
+        # Drain one client's queue; a failed send drops the client.
+        # Payloads queued during a burst go out as one JSON array frame
+        try:
+            while True:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                if len(batch) == 1:
+                    await websocket.send_text(batch[0])
+                else:
+                    await websocket.send_text(f"[{','.join(batch)}]")
+        except Exception:
+            self.disconnect(websocket)
 
     async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
+        # Encode once and queue for every client
+        # (text frames, so browser clients keep receiving strings)
+        payload = orjson.dumps(message).decode()
+        payload_hash = hash(payload)
+        
+        for connection, queue in self.active_connections.items():
+            # Skip clients that already have this exact payload
+            if self._last_hash.get(connection) == payload_hash:
+                continue
+            
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+            self._last_hash[connection] = payload_hash
 
 manager = ConnectionManager()
 
@@ -75,10 +141,13 @@ async def websocket_endpoint(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         while True:
-            data = await websocket.receive_json()
+            data = orjson.loads(await websocket.receive_text())
             # Echo back for now (implement real-time data streaming)
             await manager.broadcast(data)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also reached on malformed frames, so the client's queue and relay never leak
         manager.disconnect(websocket)
 
 # Root endpoint
@@ -108,5 +177,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="auto",
+        http="httptools",
+        ws_per_message_deflate=True,
         log_level="info"
     )
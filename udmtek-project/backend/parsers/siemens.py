@@ -4,10 +4,11 @@ Supports S7-300, S7-400, S7-1200, S7-1500 series
 Protocol: S7Comm, S7Comm-Plus
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import struct
+import sys
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,9 +32,10 @@ class InstructionType(Enum):
     COUNTER = "COUNTER"
     MATH = "MATH"
     CALL = "CALL"
+    UNKNOWN = "UNKNOWN"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PLCInstruction:
     """Represents a single PLC instruction"""
     address: int
@@ -44,7 +46,43 @@ class PLCInstruction:
     comment: Optional[str] = None
 
 
-@dataclass
+# S7 opcode word -> (mnemonic, instruction type); mnemonics are interned so
+# every decoded instruction shares the same string objects
+_OPCODE_TABLE: Dict[int, Tuple[str, InstructionType]] = {
+    opcode: (sys.intern(mnemonic), instruction_type)
+    for opcode, mnemonic, instruction_type in (
+        (0x0000, "A", InstructionType.LOGIC),
+        (0x0001, "AN", InstructionType.LOGIC),
+        (0x0002, "=", InstructionType.TRANSFER),
+        (0x1000, "L", InstructionType.LOAD),
+        (0x1100, "S", InstructionType.TRANSFER),
+        (0x2002, "CALL", InstructionType.CALL),
+    )
+}
+
+# Decoding of opcode words missing from the table
+_UNKNOWN_OPCODE = (sys.intern("UNKNOWN"), InstructionType.UNKNOWN)
+
+
+def _decode_instruction(
+    address: int,
+    raw_bytes: bytes,
+    operands: List[str],
+    comment: Optional[str] = None
+) -> PLCInstruction:
+    """Build an instruction from its raw opcode word via the opcode table"""
+    mnemonic, instruction_type = _OPCODE_TABLE.get(struct.unpack_from(">H", raw_bytes)[0], _UNKNOWN_OPCODE)
+    return PLCInstruction(
+        address=address,
+        mnemonic=mnemonic,
+        operands=operands,
+        instruction_type=instruction_type,
+        raw_bytes=raw_bytes,
+        comment=comment
+    )
+
+
+@dataclass(slots=True)
 class PLCBlock:
     """Represents a PLC program block (OB, FC, FB, DB)"""
     block_type: str  # OB, FC, FB, DB
@@ -54,6 +92,24 @@ class PLCBlock:
     metadata: Dict[str, Any]
 
 
+# Network configuration (static until real extraction is implemented)
+_NETWORK_CONFIGURATION: Dict[str, Any] = {
+    "profinet": {
+        "enabled": True,
+        "devices": ["IO-Device-1", "IO-Device-2"]
+    },
+    "profibus": {
+        "enabled": False,
+        "devices": []
+    },
+    "ethernet": {
+        "ip": "192.168.1.10",
+        "subnet": "255.255.255.0",
+        "gateway": "192.168.1.1"
+    }
+}
+
+
 class SiemensSIMATICParser:
     """
     Parser for Siemens SIMATIC PLC programs
@@ -63,6 +119,9 @@ class SiemensSIMATICParser:
     def __init__(self, model: SiemensModel = SiemensModel.S7_1500):
         self.model = model
         self.blocks: List[PLCBlock] = []
+        self._export_cache: Optional[Dict[str, Any]] = None
+        # Validation result of the parsed program (cleared on every parse)
+        self._validation: Optional[Dict[str, Any]] = None
         logger.info(f"Initialized Siemens SIMATIC Parser for {model.value}")
     
     def parse_project(self, project_file: bytes) -> List[PLCBlock]:
@@ -81,6 +140,8 @@ class SiemensSIMATICParser:
         # This is a simplified example structure
         
         self.blocks = []
+        self._export_cache = None
+        self._validation = None
         
         # Example: Parse main organization block (OB1)
         ob1 = self._parse_ob1(project_file)
@@ -103,28 +164,22 @@ class SiemensSIMATICParser:
         
         # Example instruction set (simplified)
         instructions = [
-            PLCInstruction(
+            _decode_instruction(
                 address=0,
-                mnemonic="A",
-                operands=["I0.0"],
-                instruction_type=InstructionType.LOGIC,
                 raw_bytes=b'\x00\x00',
+                operands=["I0.0"],
                 comment="Start button input"
             ),
-            PLCInstruction(
+            _decode_instruction(
                 address=2,
-                mnemonic="AN",
-                operands=["I0.1"],
-                instruction_type=InstructionType.LOGIC,
                 raw_bytes=b'\x00\x01',
+                operands=["I0.1"],
                 comment="Stop button input (normally closed)"
             ),
-            PLCInstruction(
+            _decode_instruction(
                 address=4,
-                mnemonic="=",
-                operands=["Q0.0"],
-                instruction_type=InstructionType.TRANSFER,
                 raw_bytes=b'\x00\x02',
+                operands=["Q0.0"],
                 comment="Motor output"
             ),
         ]
@@ -151,28 +206,22 @@ class SiemensSIMATICParser:
             block_number=1,
             block_name="Motor_Control",
             instructions=[
-                PLCInstruction(
+                _decode_instruction(
                     address=0,
-                    mnemonic="L",
-                    operands=["#start"],
-                    instruction_type=InstructionType.LOAD,
                     raw_bytes=b'\x10\x00',
+                    operands=["#start"],
                     comment="Load start signal"
                 ),
-                PLCInstruction(
+                _decode_instruction(
                     address=2,
-                    mnemonic="S",
-                    operands=["#motor_run"],
-                    instruction_type=InstructionType.TRANSFER,
                     raw_bytes=b'\x11\x00',
+                    operands=["#motor_run"],
                     comment="Set motor running flag"
                 ),
-                PLCInstruction(
+                _decode_instruction(
                     address=4,
-                    mnemonic="CALL",
-                    operands=["FB2", "DB2"],
-                    instruction_type=InstructionType.CALL,
                     raw_bytes=b'\x20\x02',
+                    operands=["FB2", "DB2"],
                     comment="Call safety monitoring"
                 ),
             ],
@@ -227,25 +276,14 @@ class SiemensSIMATICParser:
         pass
     
     def get_network_configuration(self) -> Dict[str, Any]:
-        """Extract network configuration from PLC"""
-        return {
-            "profinet": {
-                "enabled": True,
-                "devices": ["IO-Device-1", "IO-Device-2"]
-            },
-            "profibus": {
-                "enabled": False,
-                "devices": []
-            },
-            "ethernet": {
-                "ip": "192.168.1.10",
-                "subnet": "255.255.255.0",
-                "gateway": "192.168.1.1"
-            }
-        }
+        """Extract network configuration from PLC (shared, treat as read-only)"""
+        return _NETWORK_CONFIGURATION
     
     def validate_program(self) -> Dict[str, Any]:
-        """Validate parsed PLC program for errors"""
+        """Validate parsed PLC program for errors (cached until the next parse)"""
+        if self._validation is not None:
+            return self._validation
+        
         errors = []
         warnings = []
         
@@ -256,15 +294,19 @@ class SiemensSIMATICParser:
             # Check for timing conflicts
             pass
         
-        return {
+        self._validation = {
             "valid": len(errors) == 0,
             "errors": errors,
             "warnings": warnings
         }
+        return self._validation
     
     def export_to_dict(self) -> Dict[str, Any]:
-        """Export parsed data to dictionary format"""
-        return {
+        """Export parsed data to dictionary format (cached until the next parse)"""
+        if self._export_cache is not None:
+            return self._export_cache
+        
+        self._export_cache = {
             "plc_model": self.model.value,
             "total_blocks": len(self.blocks),
             "blocks": [
@@ -278,6 +320,7 @@ class SiemensSIMATICParser:
                 for block in self.blocks
             ]
         }
+        return self._export_cache
 
 
 # Example usage
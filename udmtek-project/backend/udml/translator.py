@@ -3,91 +3,117 @@ UDML (Unified Device Machine Language) Translator
 Converts vendor-specific PLC instructions to unified intermediate representation
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Mapping, Optional, Sequence, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from enum import Enum
-import json
+from enum import IntEnum
+from functools import lru_cache
+from itertools import islice, repeat, zip_longest
+from types import MappingProxyType
 import logging
+import os
+import sys
+import numpy as np
+import orjson
+from numba import njit
 
 logger = logging.getLogger(__name__)
 
 
-class UDMLOpcode(Enum):
-    """Unified instruction opcodes"""
+class UDMLOpcode(IntEnum):
+    """Unified instruction opcodes (small ints; names are the exported form)"""
     # Data movement
-    LOAD = "LOAD"           # Load value to accumulator
-    STORE = "STORE"         # Store accumulator to memory
-    MOVE = "MOVE"           # Move data between locations
+    LOAD = 0                # Load value to accumulator
+    STORE = 1               # Store accumulator to memory
+    MOVE = 2                # Move data between locations
     
     # Logic operations
-    AND = "AND"
-    OR = "OR"
-    XOR = "XOR"
-    NOT = "NOT"
+    AND = 3
+    OR = 4
+    XOR = 5
+    NOT = 6
     
     # Comparison
-    EQ = "EQ"               # Equal
-    NE = "NE"               # Not equal
-    GT = "GT"               # Greater than
-    LT = "LT"               # Less than
-    GE = "GE"               # Greater or equal
-    LE = "LE"               # Less or equal
+    EQ = 7                  # Equal
+    NE = 8                  # Not equal
+    GT = 9                  # Greater than
+    LT = 10                 # Less than
+    GE = 11                 # Greater or equal
+    LE = 12                 # Less or equal
     
     # Arithmetic
-    ADD = "ADD"
-    SUB = "SUB"
-    MUL = "MUL"
-    DIV = "DIV"
-    MOD = "MOD"
+    ADD = 13
+    SUB = 14
+    MUL = 15
+    DIV = 16
+    MOD = 17
     
     # Timer/Counter
-    TON = "TON"             # Timer on-delay
-    TOF = "TOF"             # Timer off-delay
-    TP = "TP"               # Timer pulse
-    CTU = "CTU"             # Count up
-    CTD = "CTD"             # Count down
-    CTUD = "CTUD"           # Count up/down
+    TON = 18                # Timer on-delay
+    TOF = 19                # Timer off-delay
+    TP = 20                 # Timer pulse
+    CTU = 21                # Count up
+    CTD = 22                # Count down
+    CTUD = 23               # Count up/down
     
     # Control flow
-    CALL = "CALL"           # Function call
-    RET = "RET"             # Return
-    JMP = "JMP"             # Jump
-    JZ = "JZ"               # Jump if zero
-    JNZ = "JNZ"             # Jump if not zero
+    CALL = 24               # Function call
+    RET = 25                # Return
+    JMP = 26                # Jump
+    JZ = 27                 # Jump if zero
+    JNZ = 28                # Jump if not zero
     
     # Special
-    NOP = "NOP"             # No operation
-    SET = "SET"             # Set output
-    RESET = "RESET"         # Reset output
+    NOP = 29                # No operation
+    SET = 30                # Set output
+    RESET = 31              # Reset output
 
 
-@dataclass
+class Vendor(IntEnum):
+    """Supported PLC vendors"""
+    SIEMENS = 0
+    MITSUBISHI = 1
+    ROCKWELL = 2
+    LS = 3
+    OMRON = 4
+
+
+# Exported opcode names, indexed by opcode id
+_OPCODE_NAMES = tuple(opcode.name for opcode in UDMLOpcode)
+
+# Opcodes counted as decision points for cyclomatic complexity
+_DECISION_OPCODES = frozenset({UDMLOpcode.JZ, UDMLOpcode.JNZ, UDMLOpcode.CALL})
+_DECISION_IDS = np.array(sorted(_DECISION_OPCODES), dtype=np.int8)
+
+
+@dataclass(slots=True, frozen=True)
 class UDMLInstruction:
     """
     Unified instruction format
     All vendor-specific instructions are translated to this format
+    (immutable; operand tuples and metadata may be shared between instructions)
     """
     opcode: UDMLOpcode
-    operands: List[str]
+    operands: Tuple[str, ...]
     source_vendor: str      # Original PLC vendor
     source_instruction: str # Original instruction mnemonic
     address: int
-    metadata: Dict[str, Any]
+    metadata: Mapping[str, Any]
     comment: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "opcode": self.opcode.value,
-            "operands": self.operands,
+            "opcode": _OPCODE_NAMES[self.opcode],
+            "operands": list(self.operands),
             "source_vendor": self.source_vendor,
             "source_instruction": self.source_instruction,
             "address": self.address,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
             "comment": self.comment
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class UDMLProgram:
     """Complete UDML program representation"""
     program_name: str
@@ -97,16 +123,67 @@ class UDMLProgram:
     functions: List[Dict[str, Any]]
     metadata: Dict[str, Any]
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, convert_instructions: bool = True) -> Dict[str, Any]:
+        """Program as a dict; convert_instructions=False keeps the instruction objects for a serializer hook"""
+        if convert_instructions:
+            return self._as_dict([inst.to_dict() for inst in self.instructions])
+        return self._as_dict(self.instructions)
+    
+    def header_dict(self) -> Dict[str, Any]:
+        """Program fields without the instruction list"""
         return {
             "program_name": self.program_name,
             "source_vendor": self.source_vendor,
             "instruction_count": len(self.instructions),
-            "instructions": [inst.to_dict() for inst in self.instructions],
             "global_variables": self.global_variables,
             "functions": self.functions,
             "metadata": self.metadata
         }
+    
+    def _as_dict(self, instructions: List[Any]) -> Dict[str, Any]:
+        return {
+            "program_name": self.program_name,
+            "source_vendor": self.source_vendor,
+            "instruction_count": len(self.instructions),
+            "instructions": instructions,
+            "global_variables": self.global_variables,
+            "functions": self.functions,
+            "metadata": self.metadata
+        }
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback: instructions one at a time, read-only metadata mappings"""
+    if isinstance(obj, UDMLInstruction):
+        return obj.to_dict()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _opcode_array(instructions: List[UDMLInstruction]) -> np.ndarray:
+    """Build the contiguous opcode-id array of an instruction list"""
+    return np.fromiter(
+        (inst.opcode for inst in instructions),
+        dtype=np.int8,
+        count=len(instructions)
+    )
+
+
+@njit(cache=True)
+def _max_nesting_depth(opcodes, call_id, ret_id):
+    """Deepest CALL nesting over an opcode array (RET unwinds, never below zero)"""
+    current = 0
+    deepest = 0
+    for i in range(opcodes.shape[0]):
+        opcode = opcodes[i]
+        if opcode == call_id:
+            current += 1
+            if current > deepest:
+                deepest = current
+        elif opcode == ret_id and current > 0:
+            current -= 1
+    return deepest
 
 
 class UDMLTranslator:
@@ -199,41 +276,80 @@ class UDMLTranslator:
         "SUB": UDMLOpcode.SUB,
     }
     
+    # Negated instructions (AND NOT etc.), flagged in metadata
+    NEGATED_MNEMONICS = frozenset({"AN", "ANI", "XIO"})
+    
+    # Shared read-only metadata for translated instructions
+    _EMPTY_META = MappingProxyType({})
+    _NEGATED_META = MappingProxyType({"negated": True})
+    _UNMAPPED_META = MappingProxyType({"warning": "unmapped_instruction"})
+    _OPTIMIZED_META = MappingProxyType({"optimized": True})
+    
     def __init__(self):
         self.vendor_mappings = {
-            "siemens": self.SIEMENS_MAPPING,
-            "mitsubishi": self.MITSUBISHI_MAPPING,
-            "rockwell": self.ROCKWELL_MAPPING,
-            "ls": self.LS_MAPPING,
-            "omron": self.OMRON_MAPPING,
+            vendor: {sys.intern(mnemonic): opcode for mnemonic, opcode in mapping.items()}
+            for vendor, mapping in (
+                ("siemens", self.SIEMENS_MAPPING),
+                ("mitsubishi", self.MITSUBISHI_MAPPING),
+                ("rockwell", self.ROCKWELL_MAPPING),
+                ("ls", self.LS_MAPPING),
+                ("omron", self.OMRON_MAPPING),
+            )
         }
+        # Mapping tables indexed by Vendor id
+        self.vendor_tables = tuple(self.vendor_mappings[v.name.lower()] for v in Vendor)
         logger.info("UDML Translator initialized")
     
-    def translate(self, vendor: str, instructions: List[Any]) -> UDMLProgram:
+    def translate(self, vendor: Union[Vendor, str], instructions: List[Any]) -> UDMLProgram:
         """
         Translate vendor-specific instructions to UDML
         
         Args:
-            vendor: PLC vendor name (siemens, mitsubishi, rockwell, ls, omron)
+            vendor: Vendor id, or PLC vendor name (siemens, mitsubishi, rockwell, ls, omron)
             instructions: List of vendor-specific instruction objects
             
         Returns:
             UDMLProgram object
         """
-        vendor_lower = vendor.lower()
-        
-        if vendor_lower not in self.vendor_mappings:
-            raise ValueError(f"Unsupported vendor: {vendor}")
+        if isinstance(vendor, Vendor):
+            vendor_id = vendor
+            vendor = vendor_lower = vendor.name.lower()
+        else:
+            vendor_lower = vendor.lower()
+            vendor_id = Vendor.__members__.get(vendor_lower.upper())
+            if vendor_id is None:
+                raise ValueError(f"Unsupported vendor: {vendor}")
         
         logger.info(f"Translating {len(instructions)} instructions from {vendor}")
         
-        mapping = self.vendor_mappings[vendor_lower]
-        udml_instructions = []
+        mapping = self.vendor_tables[vendor_id]
+        
+        # Resolve every mnemonic and its opcode up front, one table lookup each;
+        # interned mnemonics match the interned table keys by identity and are
+        # shared by all instructions using them
+        intern = sys.intern
+        mnemonics = [
+            intern(mnemonic) if type(mnemonic) is str else mnemonic
+            for mnemonic in (
+                inst.mnemonic if hasattr(inst, 'mnemonic') else str(inst)
+                for inst in instructions
+            )
+        ]
+        opcodes = list(map(mapping.get, mnemonics))
         
-        for inst in instructions:
-            udml_inst = self._translate_instruction(vendor_lower, mapping, inst)
-            if udml_inst:
-                udml_instructions.append(udml_inst)
+        # Hash-cons operands as tuples: repeated operand patterns share one
+        # immutable tuple, independent of the source instructions' lists
+        operand_pool: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        operands = [
+            operand_pool.setdefault(inst_operands, inst_operands)
+            for inst_operands in (tuple(getattr(inst, 'operands', ())) for inst in instructions)
+        ]
+        
+        # Bound method mapped over the parallel lists (no per-item lookup or tuple unpacking)
+        udml_instructions = list(map(
+            self._translate_instruction,
+            repeat(vendor_lower), instructions, mnemonics, opcodes, operands
+        ))
         
         program = UDMLProgram(
             program_name=f"{vendor}_program",
@@ -250,36 +366,46 @@ class UDMLTranslator:
         logger.info(f"Translation complete: {len(udml_instructions)} UDML instructions")
         return program
     
-    def _translate_instruction(self, vendor: str, mapping: Dict, inst: Any) -> Optional[UDMLInstruction]:
-        """Translate a single instruction"""
+    @staticmethod
+    def translate_batch(jobs: Sequence[Tuple[Union[Vendor, str], List[Any]]],
+                        max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Translate many programs in parallel worker processes
         
-        # Extract instruction mnemonic (vendor-specific)
-        mnemonic = inst.mnemonic if hasattr(inst, 'mnemonic') else str(inst)
+        Args:
+            jobs: (vendor, instructions) pairs, one per program
+            max_workers: Worker process count (defaults to CPU count)
+            
+        Returns:
+            Translated programs as dictionaries, in job order
+        """
+        if not jobs:
+            return []
+        
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * workers))
         
-        # Look up UDML opcode
-        if mnemonic not in mapping:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_translate_worker, jobs, chunksize=chunksize))
+    
+    def _translate_instruction(self, vendor: str, inst: Any, mnemonic: str,
+                               opcode: Optional[UDMLOpcode], operands: Tuple[str, ...]) -> UDMLInstruction:
+        """Translate a single instruction given its resolved mnemonic, opcode and operands"""
+        
+        if opcode is None:
             logger.warning(f"Unknown instruction for {vendor}: {mnemonic}")
             return UDMLInstruction(
                 opcode=UDMLOpcode.NOP,
-                operands=[],
+                operands=(),
                 source_vendor=vendor,
                 source_instruction=mnemonic,
                 address=getattr(inst, 'address', 0),
-                metadata={"warning": "unmapped_instruction"},
+                metadata=self._UNMAPPED_META,
                 comment=f"Unknown: {mnemonic}"
             )
         
-        opcode = mapping[mnemonic]
-        
-        # Extract operands
-        operands = []
-        if hasattr(inst, 'operands'):
-            operands = inst.operands
-        
         # Handle special cases (e.g., AND NOT -> AND with negation flag)
-        metadata = {}
-        if mnemonic in ["AN", "ANI", "XIO"]:  # Negated instructions
-            metadata["negated"] = True
+        metadata = self._NEGATED_META if mnemonic in self.NEGATED_MNEMONICS else self._EMPTY_META
         
         return UDMLInstruction(
             opcode=opcode,
@@ -300,87 +426,192 @@ class UDMLTranslator:
         """
         logger.info("Optimizing UDML program")
         
-        optimized_instructions = []
-        i = 0
+        instructions = program.instructions
+        nop, load, store = UDMLOpcode.NOP, UDMLOpcode.LOAD, UDMLOpcode.STORE
+        
+        # Single sweep over (instruction, next instruction) pairs
+        optimized_instructions = [None] * len(instructions)
+        k = 0
+        skip_next = False
         
-        while i < len(program.instructions):
-            inst = program.instructions[i]
+        for inst, next_inst in zip_longest(instructions, islice(instructions, 1, None)):
+            if skip_next:
+                skip_next = False
+                continue
+            
+            opcode = inst.opcode
             
             # Example optimization: Remove NOP instructions
-            if inst.opcode == UDMLOpcode.NOP:
-                i += 1
+            if opcode == nop:
                 continue
             
             # Example: Combine LOAD + STORE -> MOVE
-            if (i < len(program.instructions) - 1 and
-                inst.opcode == UDMLOpcode.LOAD and
-                program.instructions[i+1].opcode == UDMLOpcode.STORE):
-                
-                move_inst = UDMLInstruction(
-                    opcode=UDMLOpcode.MOVE,
-                    operands=[inst.operands[0], program.instructions[i+1].operands[0]],
-                    source_vendor=inst.source_vendor,
-                    source_instruction="OPTIMIZED",
-                    address=inst.address,
-                    metadata={"optimized": True},
-                    comment="Combined LOAD+STORE"
-                )
-                optimized_instructions.append(move_inst)
-                i += 2
+            if opcode == load and next_inst is not None and next_inst.opcode == store:
+                optimized_instructions[k] = self._combine_load_store(inst, next_inst)
+                k += 1
+                skip_next = True
                 continue
             
-            optimized_instructions.append(inst)
-            i += 1
+            optimized_instructions[k] = inst
+            k += 1
+        
+        del optimized_instructions[k:]
         
         program.instructions = optimized_instructions
         logger.info(f"Optimization complete: {len(optimized_instructions)} instructions")
         
         return program
     
-    def export_json(self, program: UDMLProgram, filepath: str):
+    def analyze_and_optimize(self, program: UDMLProgram) -> Tuple[UDMLProgram, Dict[str, Any]]:
+        """
+        Optimize a program and analyze the result in one sweep
+        Same outcome as optimize() followed by analyze_complexity()
+        """
+        logger.info("Optimizing and analyzing UDML program")
+        
+        instructions = program.instructions
+        nop, load, store, move = UDMLOpcode.NOP, UDMLOpcode.LOAD, UDMLOpcode.STORE, UDMLOpcode.MOVE
+        call, ret = UDMLOpcode.CALL, UDMLOpcode.RET
+        decision_opcodes = _DECISION_OPCODES
+        
+        optimized_instructions = [None] * len(instructions)
+        counts = [0] * len(_OPCODE_NAMES)
+        k = 0
+        decision_points = 0
+        depth = 0
+        max_depth = 0
+        skip_next = False
+        
+        for inst, next_inst in zip_longest(instructions, islice(instructions, 1, None)):
+            if skip_next:
+                skip_next = False
+                continue
+            
+            opcode = inst.opcode
+            if opcode == nop:
+                continue
+            
+            if opcode == load and next_inst is not None and next_inst.opcode == store:
+                inst = self._combine_load_store(inst, next_inst)
+                opcode = move
+                skip_next = True
+            
+            optimized_instructions[k] = inst
+            k += 1
+            
+            # Reductions over the emitted instruction
+            counts[opcode] += 1
+            if opcode in decision_opcodes:
+                decision_points += 1
+            if opcode == call:
+                depth += 1
+                if depth > max_depth:
+                    max_depth = depth
+            elif opcode == ret and depth > 0:
+                depth -= 1
+        
+        del optimized_instructions[k:]
+        
+        program.instructions = optimized_instructions
+        
+        complexity = {
+            "total_instructions": k,
+            "opcode_distribution": {
+                _OPCODE_NAMES[opcode]: count
+                for opcode, count in enumerate(counts)
+                if count
+            },
+            "cyclomatic_complexity": decision_points + 1,
+            "max_nesting_depth": max_depth
+        }
+        logger.info(f"Optimization complete: {k} instructions")
+        
+        return program, complexity
+    
+    def _combine_load_store(self, load_inst: UDMLInstruction, store_inst: UDMLInstruction) -> UDMLInstruction:
+        """Combine a LOAD and the STORE after it into one MOVE"""
+        return UDMLInstruction(
+            opcode=UDMLOpcode.MOVE,
+            operands=(load_inst.operands[0], store_inst.operands[0]),
+            source_vendor=load_inst.source_vendor,
+            source_instruction="OPTIMIZED",
+            address=load_inst.address,
+            metadata=self._OPTIMIZED_META,
+            comment="Combined LOAD+STORE"
+        )
+    
+    def export_json(self, program: UDMLProgram, filepath: str, pretty: bool = True):
         """Export UDML program to JSON file"""
-        with open(filepath, 'w') as f:
-            json.dump(program.to_dict(), f, indent=2)
+        # Instructions are converted one at a time by the default hook
+        # (opcodes export by name), never as a full list of dicts
+        # Written as UTF-8; non-ASCII text is not \u-escaped
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | (orjson.OPT_INDENT_2 if pretty else 0)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(program.to_dict(convert_instructions=False), default=_json_default, option=option))
+        logger.info(f"UDML program exported to {filepath}")
+    
+    def export_jsonl(self, program: UDMLProgram, filepath: str):
+        """Export UDML program as JSON Lines: a header line, then one line per instruction (UTF-8)"""
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_APPEND_NEWLINE
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(program.header_dict(), option=option))
+            f.writelines(
+                orjson.dumps(inst, default=_json_default, option=option)
+                for inst in program.instructions
+            )
         logger.info(f"UDML program exported to {filepath}")
     
     def analyze_complexity(self, program: UDMLProgram) -> Dict[str, Any]:
         """Analyze program complexity metrics"""
         
-        opcode_counts = {}
-        for inst in program.instructions:
-            opcode = inst.opcode.value
-            opcode_counts[opcode] = opcode_counts.get(opcode, 0) + 1
+        # Contiguous opcode array, built once and shared by all analysis passes
+        opcodes = _opcode_array(program.instructions)
+        
+        # Histogram in one pass over the opcode array
+        counts = np.bincount(opcodes, minlength=len(_OPCODE_NAMES))
+        opcode_counts = {
+            _OPCODE_NAMES[opcode]: int(count)
+            for opcode, count in enumerate(counts)
+            if count
+        }
         
         return {
             "total_instructions": len(program.instructions),
             "opcode_distribution": opcode_counts,
-            "cyclomatic_complexity": self._calculate_cyclomatic_complexity(program),
-            "max_nesting_depth": self._calculate_nesting_depth(program)
+            "cyclomatic_complexity": self._calculate_cyclomatic_complexity(program, opcodes),
+            "max_nesting_depth": self._calculate_nesting_depth(program, opcodes)
         }
     
-    def _calculate_cyclomatic_complexity(self, program: UDMLProgram) -> int:
+    def _calculate_cyclomatic_complexity(self, program: UDMLProgram,
+                                         opcodes: Optional[np.ndarray] = None) -> int:
         """Calculate McCabe cyclomatic complexity"""
+        if opcodes is None:
+            opcodes = _opcode_array(program.instructions)
+        
         # Simplified calculation
-        decision_points = sum(
-            1 for inst in program.instructions
-            if inst.opcode in [UDMLOpcode.JZ, UDMLOpcode.JNZ, UDMLOpcode.CALL]
-        )
+        decision_points = int(np.isin(opcodes, _DECISION_IDS).sum())
         return decision_points + 1
     
-    def _calculate_nesting_depth(self, program: UDMLProgram) -> int:
+    def _calculate_nesting_depth(self, program: UDMLProgram,
+                                 opcodes: Optional[np.ndarray] = None) -> int:
         """Calculate maximum nesting depth"""
-        # Simplified calculation based on CALL depth
-        max_depth = 0
-        current_depth = 0
-        
-        for inst in program.instructions:
-            if inst.opcode == UDMLOpcode.CALL:
-                current_depth += 1
-                max_depth = max(max_depth, current_depth)
-            elif inst.opcode == UDMLOpcode.RET:
-                current_depth = max(0, current_depth - 1)
+        if opcodes is None:
+            opcodes = _opcode_array(program.instructions)
         
-        return max_depth
+        # Simplified calculation based on CALL depth
+        return int(_max_nesting_depth(opcodes, int(UDMLOpcode.CALL), int(UDMLOpcode.RET)))
+
+
+@lru_cache(maxsize=None)
+def _worker_translator() -> UDMLTranslator:
+    """One translator per worker process"""
+    return UDMLTranslator()
+
+
+def _translate_worker(job: Tuple[Union[Vendor, str], List[Any]]) -> Dict[str, Any]:
+    """Translate one (vendor, instructions) job; returns a dict to keep IPC cheap"""
+    vendor, instructions = job
+    return _worker_translator().translate(vendor, instructions).to_dict()
 
 
 # Example usage
@@ -405,7 +636,7 @@ if __name__ == "__main__":
     print(f"  Instructions: {len(udml_program.instructions)}")
     
     for inst in udml_program.instructions:
-        print(f"    {inst.opcode.value}: {inst.operands} (from {inst.source_instruction})")
+        print(f"    {inst.opcode.name}: {inst.operands} (from {inst.source_instruction})")
     
     # Analyze complexity
     complexity = translator.analyze_complexity(udml_program)